@@ -18,12 +18,43 @@ import sys
 import datetime
 import subprocess
 import textwrap
+import concurrent.futures
+import queue
+import threading
+import json
+import hashlib
+import tempfile
+import functools
+
+# Optional Rust accelerator for the recursive directory walk (built separately
+# with maturin from the macos_scan_rs crate). Falls back to the pure-Python
+# scandir loop when not installed.
+try:
+    from macos_scan_rs import directory_summary as _rs_directory_summary
+except ImportError:
+    _rs_directory_summary = None
 
 # --- GLOBAL CONFIGURATION & GLOBAL DATA OBJECTS ---
 
+# Per-entry debug output (one or more lines per file/directory scanned) can
+# dominate runtime on big filesystems purely from terminal writes. Set
+# SCAN_DEBUG=1 to get it back.
+DEBUG = os.environ.get("SCAN_DEBUG") == "1"
+
 # Global registry for all processed (scanned/handled) paths
 scanned_paths = set()
 
+# Trie of path components mirroring scanned_paths, kept in sync by
+# register_scanned_path. Answers "is this exact path scanned" and "does a
+# scanned path live beneath this path" in O(path depth) dict lookups instead
+# of a startswith scan over the whole registry.
+scanned_trie = {}
+_TRIE_END = ""  # sentinel child key marking the end of a registered path
+
+# Paths built via os.path.join / scandir are already canonical; only paths
+# showing one of these shapes actually need an os.path.normpath pass.
+_needs_normalize = re.compile(r'//|/\.(?:/|$)|/\.\.(?:/|$)|[^/]/$').search
+
 # Global objects for accumulated data
 global_system_custom_apps = []      # list of custom (non-brew) apps in /Applications
 global_system_brew_apps = []        # list of brew-installed apps in /Applications
@@ -48,9 +79,18 @@ IGNORED_ROOT_DIRS = [
     "/.vol", "/opt", "/dev", "/Volumes",
     "/.nofollow", "/tmp"
     ]
+# These literals feed register_scanned_path, which no longer normalizes, so
+# canonicalize them here once.
+IGNORED_ROOT_DIRS = [os.path.normpath(p) for p in IGNORED_ROOT_DIRS]
+
+# Both lists name exact top-level directories, so the per-entry filter is a
+# single O(1) membership test. (The old prefix matching would also have
+# spuriously matched e.g. /etc-custom against /etc.)
+_IGNORED_OR_INCLUDED_TOP = frozenset(IGNORED_ROOT_DIRS) | frozenset(INCLUDE_ROOT_DIRS)
 
 # Default macOS Applications that we consider “built-in” and ignore.
-DEFAULT_APPS_WHITELIST = [
+# Only ever membership-tested, so a frozenset gives O(1) lookups.
+DEFAULT_APPS_WHITELIST = frozenset([
     "Safari", "Mail", "Calendar", "FaceTime",
     "Messages", "Notes", "App Store", "System Preferences",
     "Finder", "Contacts", "Reminders", "Maps",
@@ -64,14 +104,18 @@ DEFAULT_APPS_WHITELIST = [
     "QuickTime Player", "DVD Player", "Chess", "Migration Assistant",
     "Feedback Assistant", "ColorSync Utility", "Audio MIDI Setup",
     "Bluetooth File Exchange", "Boot Camp Assistant"
-]
+])
+# Lowercased view for the /Applications classification, which compares
+# case-insensitively (matching how the brew cask names are handled).
+_DEFAULT_APPS_WHITELIST_LOWER = frozenset(a.lower() for a in DEFAULT_APPS_WHITELIST)
 
 # For user manual customizations, only these top-level folders are “included”
-INCLUDE_USER_FOLDERS = ["Desktop", "Downloads"]
+INCLUDE_USER_FOLDERS = frozenset(["Desktop", "Downloads"])
 SCAN_USER_GRAY_AREA_FOLDERS = ["Library/Application Support", "Documents", "Music", "Movies", "Pictures"]
 
 # For user manual customizations, these top-level folders will be skipped entirely
-IGNORE_USER_FOLDERS = [
+# (frozenset: tested for membership on every crawled /Users path)
+IGNORE_USER_FOLDERS = frozenset([
     ".Trash",".ansible",".asdf",".aws",".berkshelf",".bundle",".cache",".cups",
     ".docker",".dropbox",".npm",".vscode",".yarn",".zsh_sessions","Native Instruments",
     "Accessibility","Accounts","AppleMediaServices","AddressBook","Adobe","Alfred",
@@ -101,104 +145,226 @@ IGNORE_USER_FOLDERS = [
     "Sounds","Spelling","Spotlight","Staging","StatusKit","Stickers","studentd",
     "Suggestions","SyncedPreferences","Translation","Trial","UnifiedAssetFramework",
     "Weather","WebKit","Animoji","TV",".BurpSuite",".config","venv","Public"
-    ]
+    ])
+
+# The per-user gray-area reports all end with the same AI prompt; dedent the
+# literal once at module load instead of per user in write_reports.
+USER_GRAY_AI_PROMPT = textwrap.dedent("""\
+    AI Prompt Continued:              
+    The Five‑Level Framework
+
+    The framework breaks down all observed modifications into five categories:
+        1.	Default State of the Computer
+    Items and settings that come pre‑installed or pre‑configured by the operating system and vendor.
+    Examples:
+        •	OS system files and folders
+        •	Pre‑installed applications and default settings
+        •	Standard library files and directories in /System or /Applications on macOS
+        2.	Intentional Customizations
+    Modifications you deliberately make to tailor the system to your needs.
+    Examples:
+        •	Manual configuration changes (shell profiles, custom app shortcuts)
+        •	Installation of selected software packages (e.g., using Homebrew) where you explicitly choose the application
+        •	Changes to system or application settings that are applied deliberately
+        3.	User‑Created Documents
+    Files that you generate or save for work, personal projects, or other purposes. These are typically important data that require regular backup.
+    Examples:
+        •	Documents in your ~/Documents folder
+        •	Files saved on the Desktop or other designated data directories
+        •	Project files and code that are not part of system configurations
+        4.	Cascading Dependencies (Side‑Effects of Intentional Changes)
+    Additional files or libraries that are installed automatically when you perform an intentional action. These are not explicitly chosen by you but are brought in as a dependency.
+    Examples:
+        •	When installing MySQL via Homebrew, libraries (such as a curses library) that are installed automatically
+        •	Auto‑resolved dependency packages that are not manually selected
+        5.	Transactional (Ephemeral) Files
+    Files generated during regular system use that are transient or routine byproducts. These files typically do not require manual backup or long‑term tracking.
+    Examples:
+        •	Log files (in /var/log or ~/Library/Logs)
+        •	Cache files (in /Library/Caches or application‑specific cache directories)
+        •	Temporary files created during application use
+
+    My goal in giving you this is that you can identify the:
+    - Intentional Customizations
+    - User‑Created Documents
+
+    ... and ignore everything else.  You are preparing to back up this stuff we DO care about. Give me:
+    1. a list of top-level items only that can be ignored and why
+    2. give me a command to do a `tar -czvpf` (to be run from within that home dir) to zip up of the ones that are worth keeping
+    3. Give me a paragraph with the reasoning behind keeping the files you chose.
+
+    Please, lean towards excluding more than including.  We want to be sure we are not backing up unnecessary files.  If you are unsure about a file, it is better to exclude it.  We can always come back and add it later if needed.  Especially with dot files and folders, if it is from a package you recognize, and it doesn't have secret keys or something, then I don't really want to keep it.
+    """)
 
 # Patterns to ignore (e.g. names starting with a dot)
 IGNORED_NAME_PATTERNS = [re.compile(r'^\.')]
 
+# The dot-prefix case is handled with a plain str.startswith on the hot path;
+# any extra patterns added above are combined into one alternation compiled once.
+_EXTRA_NAME_PATTERNS = [p for p in IGNORED_NAME_PATTERNS if p.pattern != r'^\.']
+_extra_name_match = (
+    re.compile("|".join(f"(?:{p.pattern})" for p in _EXTRA_NAME_PATTERNS)).match
+    if _EXTRA_NAME_PATTERNS else None)
+
 # Substrings (case-insensitive) in a path that cause the file/folder to be omitted from manual report
 IGNORED_PATH_SUBSTRINGS = ["library/caches", "library/news", "library/finances"]
 
+# One case-insensitive alternation over the substrings, compiled once; the
+# bound .search avoids a per-call attribute lookup on the hot path.
+_ignored_path_search = re.compile(
+    "|".join(map(re.escape, IGNORED_PATH_SUBSTRINGS)), re.IGNORECASE).search
+
 # Limit for immediate listing (if too many items, you might later add logic to summarize)
 MAX_ITEMS = 100
 
+# Brew output changes rarely between scans, so cache it on disk with a TTL
+# (seconds; override with the MACOS_SCAN_BREW_TTL env var).
+BREW_CACHE_DIR = os.path.expanduser("~/.cache/macos-scan")
+BREW_CACHE_TTL = int(os.environ.get("MACOS_SCAN_BREW_TTL", 24 * 60 * 60))
+
 # --- NEW FUNCTIONS TO TRACK & CRAWL PROCESSED PATHS ---
 
 def register_scanned_path(path):
     """
     Register a path (file or directory) as having been processed.
-    The normalized version of the given path is added to the global scanned_paths set.
+    Callers pass paths built with os.path.join (or scandir entry paths), which
+    are already canonical on POSIX, so no per-call normpath is done here.
     """
     global scanned_paths
-    print(f"Registering scanned path: {path}")
-    scanned_paths.add(os.path.normpath(path))
+    if DEBUG:
+        print(f"Registering scanned path: {path}")
+    if _needs_normalize(path):
+        path = os.path.normpath(path)
+    with _state_lock:
+        scanned_paths.add(path)
+        node = scanned_trie
+        for part in path.split(os.sep):
+            if part:
+                node = node.setdefault(part, {})
+        node[_TRIE_END] = True
+
+def _trie_lookup(path):
+    """
+    Walk the scanned-path trie along the given path's components.
+    Returns the trie node reached, or None if the path diverges from every
+    registered path.
+    """
+    node = scanned_trie
+    for part in path.split(os.sep):
+        if part:
+            node = node.get(part)
+            if node is None:
+                return None
+    return node
+
+def is_scanned_path(path):
+    """
+    Check whether the exact path has been registered via register_scanned_path.
+    """
+    node = _trie_lookup(path)
+    return node is not None and _TRIE_END in node
+
+# Guards the shared globals (scanned_paths, the trie, gray/ignore objects)
+# whenever gather or crawl threads record their findings. Re-entrant because
+# the record_* helpers lock around bodies that also call
+# register_scanned_path, which locks again.
+_state_lock = threading.RLock()
 
-def crawl_remaining_paths(base="/"):
+def crawl_remaining_paths(base="/", num_workers=8):
     """
     Crawl the entire filesystem starting at the given base directory,
     skipping any path that has already been registered via register_scanned_path.
-    For each new directory encountered, record a shallow listing in global_remaining_gray.
-    Debug output is printed on the same terminal line (overwriting it) to show progress.
+    The unit of work is "scan one directory": a pool of worker threads pops
+    directories off a shared queue, classifies their entries, and pushes child
+    directories that need drilling back on. The crawl is metadata-latency
+    bound, so independent directories overlap their syscalls across workers.
     """
-    global global_remaining_gray
-    for root, dirs, files in os.walk(base, topdown=True):
-        # Skip if it is a symlink
-        if os.path.islink(root):
-            continue
+    work = queue.Queue()
+    work.put(os.path.normpath(base))
+    for _ in range(num_workers):
+        threading.Thread(target=_crawl_worker, args=(work,), daemon=True).start()
+    work.join()
+    sys.stdout.write("\nCrawl complete.\n")
+    sys.stdout.flush()
 
-        print(f"=========> Scanning directory: {root}\n")
-        # prinf files
-        # print(f"Files: {files}\n")
-        # print(f"Dirs: {dirs}\n")
-        normalized_root = os.path.normpath(root)
-        if normalized_root in scanned_paths:
-            print(f"   X==X Skipping already scanned path: {normalized_root}")
-            dirs[:] = []  # do not descend further
+def _crawl_worker(work):
+    while True:
+        directory = work.get()
+        try:
+            _crawl_one_directory(directory, work)
+        except Exception as e:
+            print(f"Error crawling {directory}: {e}")
+        finally:
+            work.task_done()
+
+def _crawl_one_directory(directory, work):
+    """
+    Scan a single directory for the crawl: skip anything already registered,
+    enqueue child directories that have scanned paths beneath them (drill), and
+    record everything else as gray area (per-user or top-level).
+    """
+    if DEBUG:
+        print(f"=========> Scanning directory: {directory}\n")
+    if is_scanned_path(directory):
+        if DEBUG:
+            print(f"   X==X Skipping already scanned path: {directory}")
+        return
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
             continue
-        sys.stdout.flush()
-        # Process files (debug output only)
-        for file in files:
-            full_path = os.path.join(root, file)
-            normalized_file = os.path.normpath(full_path)
-            if normalized_file in scanned_paths:
-                print(f"   X==X Skipping already scanned path: {normalized_file}")
-                continue
-            sys.stdout.write(f"Scanning file: {normalized_file} \n")
-            sys.stdout.flush()
-        # For each new directory, update global_remaining_gray with a shallow listing.
-        new_dirs = []
-        for d in dirs:
-            d_full = os.path.join(root, d)
-            normalized_d = os.path.normpath(d_full)
-            if normalized_d in scanned_paths:
+        normalized_d = entry.path
+        if not is_dir:
+            # Files: debug output only
+            if DEBUG:
+                if is_scanned_path(normalized_d):
+                    print(f"   X==X Skipping already scanned path: {normalized_d}")
+                else:
+                    sys.stdout.write(f"Scanning file: {normalized_d} \n")
+            continue
+        if is_scanned_path(normalized_d):
+            if DEBUG:
                 print(f"   X==X Skipping already scanned path: {normalized_d}")
-            else:
-                # test: if there is a seen path that is a child of this path, then drill deeper
-                if scanned_path_exists_as_subdirectory(normalized_d):
+        else:
+            # test: if there is a seen path that is a child of this path, then drill deeper
+            if scanned_path_exists_as_subdirectory(normalized_d):
+                if DEBUG:
                     sys.stdout.write(f"Drilling deeper into: {normalized_d} \n")
-                    new_dirs.append(d)
-                    # try:
-                    #     listing = os.listdir(normalized_d)
-                    #     listing = [i for i in listing if not should_ignore_name(i)]
-                    # except Exception:
-                    #     listing = []
-                    # global_remaining_gray[normalized_d] = listing
-                else:
+                work.put(normalized_d)
+            else:
+                if DEBUG:
                     sys.stdout.write(f"Recording directory as gray area: {normalized_d} \n")
-                    # if under a User directory, record the gray area for that user
-                    if normalized_d.startswith("/Users/"):
-                        user = normalized_d.split("/")[2]
-                        path_within_user = normalized_d[len(f"/Users/{user}/"):]
-                        if path_within_user in IGNORE_USER_FOLDERS or path_within_user.startswith("com."):
+                # if under a User directory, record the gray area for that user
+                if normalized_d.startswith("/Users/"):
+                    user = normalized_d.split("/")[2]
+                    path_within_user = normalized_d[len(f"/Users/{user}/"):]
+                    if path_within_user in IGNORE_USER_FOLDERS or path_within_user.startswith("com."):
+                        with _state_lock:
                             record_ignore_path(os.path.join(normalized_d, path_within_user))
-                            continue
+                        continue
 
+                    with _state_lock:
                         record_user_gray(user, normalized_d)
-                    else:
+                else:
+                    with _state_lock:
                         record_top_level_gray(normalized_d)
-        dirs[:] = new_dirs
-    sys.stdout.write("\nCrawl complete.\n")
-    sys.stdout.flush()
 
 def scanned_path_exists_as_subdirectory(path):
     """
-    Check if the given path (file or directory) exists as a file or directory under any scanned path.
+    Check if any registered scanned path lives strictly beneath the given path.
+    Answered from the trie in O(path depth) instead of scanning scanned_paths.
     """
-    for scanned_path in scanned_paths:
-        # print(f"Checking if {path} is under {scanned_path}")
-        if scanned_path.startswith(path + os.sep):
-            return True
-    return False
+    node = _trie_lookup(path)
+    if node is None:
+        return False
+    # Child component keys mean a registered path continues beneath this one.
+    return any(key != _TRIE_END for key in node)
 
 # --- UTILITY FUNCTIONS ---
 
@@ -206,40 +372,106 @@ def ensure_output_dirs():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(GRAY_AREA_DIR, exist_ok=True)
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 def human_readable_size(size, decimal_places=1):
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.{decimal_places}f} {unit}"
-        size /= 1024.0
-    return f"{size:.{decimal_places}f} PB"
+    # 1024 = 2**10, so the unit index is just the bit length divided by 10 —
+    # no division loop needed.
+    if size <= 0:
+        return f"{0:.{decimal_places}f} B"
+    i = min((int(size).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * i)):.{decimal_places}f} {_SIZE_UNITS[i]}"
 
 def get_directory_summary(path):
     """
     Recursively compute the total number of files and total size (in bytes) for a directory.
+    Uses an explicit stack of os.scandir() calls so each entry's cached stat info is
+    reused (os.walk would issue a second stat per file via os.path.getsize).
     """
+    if _rs_directory_summary is not None:
+        try:
+            return _rs_directory_summary(path, ["."])
+        except Exception:
+            pass  # fall back to the Python walk
     total_size = 0
     file_count = 0
-    for root, dirs, files in os.walk(path, topdown=True):
-        # Skip hidden subdirectories
-        dirs[:] = [d for d in dirs if not any(p.match(d) for p in IGNORED_NAME_PATTERNS)]
-        for f in files:
-            if any(p.match(f) for p in IGNORED_NAME_PATTERNS):
-                continue
+    pending_dirs = [path]
+    while pending_dirs:
+        current = pending_dirs.pop()
+        files = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    # Skip hidden entries before touching any stat info; a
+                    # direct first-character compare beats the startswith
+                    # method call at this call frequency
+                    if entry.name[0] == '.':
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        # Stat files in inode order: readdir order can seek all over the disk,
+        # while inode order follows on-disk metadata locality (a real win on
+        # HFS+ and network mounts, a no-op on APFS). DirEntry.inode() is
+        # answered from the directory read, so the sort costs no syscalls.
+        files.sort(key=lambda e: e.inode())
+        for entry in files:
             try:
-                full_path = os.path.join(root, f)
-                total_size += os.path.getsize(full_path)
+                total_size += entry.stat(follow_symlinks=False).st_size
                 file_count += 1
-            except Exception:
+            except OSError:
                 continue
     return file_count, total_size
 
 def run_brew_command(args):
+    """
+    Run a brew command, caching its parsed output on disk.
+    Brew startup alone is multi-second, so repeated scans within
+    BREW_CACHE_TTL reuse the previous run's output instead of forking brew.
+    """
+    cache_file = os.path.join(
+        BREW_CACHE_DIR,
+        f"brew_{hashlib.sha1(' '.join(args).encode()).hexdigest()}.json")
     try:
-        full_args = ["brew"] + args
-        # Check if running as sudo, if so, drop duso to run brew as a normal user
-        if os.geteuid() == 0:
-            print(f"Running as root, dropping to user ({os.getenv('SUDO_USER')}) to run brew")
-            full_args = ["sudo", "-u", os.getenv("SUDO_USER"), "brew"] + args
+        if os.path.getmtime(cache_file) + BREW_CACHE_TTL > datetime.datetime.now().timestamp():
+            with open(cache_file) as f:
+                return json.load(f)
+    except Exception:
+        pass  # missing/stale/corrupt cache: fall through to running brew
+
+    parsed = _run_brew_command_uncached(args)
+    if parsed:
+        try:
+            os.makedirs(BREW_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=BREW_CACHE_DIR)
+            with os.fdopen(fd, "w") as f:
+                json.dump(parsed, f)
+            os.replace(tmp_path, cache_file)
+        except Exception as e:
+            print(f"Warning: could not write brew cache: {e}")
+    return parsed
+
+@functools.lru_cache(maxsize=None)
+def _brew_prefix():
+    """
+    Compute the argv prefix for invoking brew once; the euid / SUDO_USER
+    checks don't change between calls in the same scan.
+    """
+    # Check if running as sudo, if so, drop duso to run brew as a normal user
+    if os.geteuid() == 0:
+        print(f"Running as root, dropping to user ({os.getenv('SUDO_USER')}) to run brew")
+        return ("sudo", "-u", os.getenv("SUDO_USER"), "brew")
+    return ("brew",)
+
+def _run_brew_command_uncached(args):
+    try:
+        full_args = list(_brew_prefix()) + args
 
         # Grab stdout and error, so we can debug if there is an error
         result = subprocess.run(full_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False, text=True)
@@ -264,17 +496,13 @@ def get_brew_casks():
     return run_brew_command(["list", "--cask"])
 
 def should_ignore_name(name):
-    for pattern in IGNORED_NAME_PATTERNS:
-        if pattern.match(name):
-            return True
-    return False
+    if name.startswith('.'):
+        return True
+    return _extra_name_match is not None and _extra_name_match(name) is not None
 
+@functools.lru_cache(maxsize=4096)
 def should_ignore_path(path):
-    lower_path = path.lower()
-    for substr in IGNORED_PATH_SUBSTRINGS:
-        if substr in lower_path:
-            return True
-    return False
+    return _ignored_path_search(path) is not None
 
 # --- GATHERING FUNCTIONS (Data Accumulation, update globals) ---
 
@@ -286,66 +514,100 @@ def gather_system_applications(brew_casks):
     Updates global_system_custom_apps and global_system_brew_apps.
     """
     apps_path = "/Applications"
+    # Lowercase the cask list once so each app is an O(1) set lookup instead
+    # of a rescan of the whole list.
+    cask_set = frozenset(cask.lower() for cask in brew_casks)
     if os.path.isdir(apps_path):
-        for item in os.listdir(apps_path):
-            full_item = os.path.join(apps_path, item)
-            if item.endswith(".app"):
-                record_application(full_item, brew_casks)
+        with os.scandir(apps_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".app"):
+                    record_application(entry.path, cask_set)
     global_system_custom_apps.sort()
     global_system_brew_apps.sort()
 
-def record_application(full_item, brew_casks):
+def record_application(full_item, cask_set):
     """
     Process a single application, updating the appropriate global list and registering the path.
+    cask_set is the pre-lowercased set of brew cask names.
     """
     global global_system_custom_apps, global_system_brew_apps
     register_scanned_path(full_item)
-    base = os.path.basename(full_item)[:-4]
+    # Split the basename off once and slice, instead of three basename calls
+    name = full_item.rsplit('/', 1)[-1]
+    base = name[:-4]
     base_lower = base.lower()
-    if any(base_lower == cask.lower() for cask in brew_casks):
-        global_system_brew_apps.append(os.path.basename(full_item))
+    if base_lower in cask_set:
+        global_system_brew_apps.append(name)
     else:
-        if base in DEFAULT_APPS_WHITELIST:
+        if base_lower in _DEFAULT_APPS_WHITELIST_LOWER:
             record_ignore_path(full_item)
-        else:    
-            global_system_custom_apps.append(os.path.basename(full_item))
+        else:
+            global_system_custom_apps.append(name)
 
-def gather_brew_formulas():
+def gather_brew_formulas(formulas=None):
     """
     Retrieves brew formulas (explicit installs) and updates global_brew_formulas.
+    Accepts an already-fetched list (e.g. from a concurrent brew call in main());
+    otherwise runs `brew leaves` itself.
     """
     global global_brew_formulas
-    formulas = get_brew_leaves()
+    if formulas is None:
+        formulas = get_brew_leaves()
     print(f"Formulas: {formulas}")
     formulas.sort()
     global_brew_formulas = formulas
 
-def gather_user_manual_customizations():
+def gather_user_areas():
     """
-    For each user in /Users (skipping Shared/Guest), examines only the selected top-level folders
-    (INCLUDE_USER_FOLDERS). For each folder that exists, calls record_user_manual_customization()
-    to compute and record its summary.
-    
-    The effect is that global_user_manual is updated with one summary entry per folder per user,
+    For each user in /Users (skipping Shared/Guest), runs scan_user() to split the
+    home directory's top-level entries between manual-customization summaries
+    (INCLUDE_USER_FOLDERS) and gray areas in a single directory read, instead of
+    listing every home directory once per phase.
+
+    global_user_manual is updated with one summary entry per folder per user,
     each following the exact format:
       "{folder}: {immediate_count} immediate items, {file_count} files total, {hr_size}"
+    global_user_gray is updated as a side effect of scan_user().
     """
     global global_user_manual
     global_user_manual = {}  # reset or initialize the global state
     users_dir = "/Users"
+    tasks = []  # list of (user, folder, target) triples to summarize
     try:
-        for user in os.listdir(users_dir):
-            user_path = os.path.join(users_dir, user)
-            if not os.path.isdir(user_path) or user.lower() in ["shared", "guest"]:
-                continue
-            for folder in INCLUDE_USER_FOLDERS:
-                target = os.path.join(user_path, folder)
-                if os.path.isdir(target):
-                    record_user_manual_customization(user, folder, target)
+        with os.scandir(users_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False) or entry.name.lower() in ["shared", "guest"]:
+                    continue
+                tasks.extend(scan_user(entry.name, entry.path))
     except Exception:
         pass
-
-def record_user_manual_customization(user, folder, target):
+    # Peek each target first: an empty folder gets its zero summary recorded
+    # directly, with no recursive walker (or worker thread) spawned for it.
+    pending = []
+    for user, folder, target in tasks:
+        try:
+            with os.scandir(target) as entries:
+                if next(entries, None) is None:
+                    record_user_manual_customization(user, folder, target, (0, 0))
+                    continue
+        except OSError:
+            pass
+        pending.append((user, folder, target))
+    if not pending:
+        return
+    # Each target is an independent subtree, so the recursive summaries can run
+    # concurrently (the GIL releases around the scandir/stat syscalls).
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+        future_map = {
+            executor.submit(get_directory_summary, target): (user, folder, target)
+            for (user, folder, target) in pending
+        }
+        for future in concurrent.futures.as_completed(future_map):
+            user, folder, target = future_map[future]
+            file_count, total_size = future.result()
+            record_user_manual_customization(user, folder, target, (file_count, total_size))
+
+def record_user_manual_customization(user, folder, target, summary_counts=None):
     """
     For a given user and a given folder (with name folder) at path target:
       - Registers the target as scanned.
@@ -356,8 +618,10 @@ def record_user_manual_customization(user, folder, target):
       - Formats the summary string exactly as:
           "{folder}: {immediate_count} immediate items, {file_count} files total, {hr_size}"
       - Updates global_user_manual for the given user by appending this summary.
-      
+
     This is the only function that updates global_user_manual for a manual customization entry.
+    If summary_counts is given it is a precomputed (file_count, total_size) pair
+    (e.g. from a worker thread); otherwise get_directory_summary is called here.
     """
     register_scanned_path(target)
     try:
@@ -366,7 +630,9 @@ def record_user_manual_customization(user, folder, target):
     except Exception:
         immediate_count = 0
 
-    file_count, total_size = get_directory_summary(target)
+    if summary_counts is None:
+        summary_counts = get_directory_summary(target)
+    file_count, total_size = summary_counts
     hr_size = human_readable_size(total_size)
     summary = f"{folder}: {immediate_count} immediate items, {file_count} files total, {hr_size}"
 
@@ -375,42 +641,50 @@ def record_user_manual_customization(user, folder, target):
         global_user_manual[user] = []
     global_user_manual[user].append(summary)
 
-def gather_user_gray_area():
+def scan_user(user, user_path):
     """
-    For each user in /Users (skipping Shared/Guest), lists any top-level folder (or file)
-    that is either hidden or not in INCLUDE_USER_FOLDERS (and not in IGNORE_USER_FOLDERS).
-    For each such directory, performs a shallow listing (one level only) and updates global_user_gray.
+    Scan one user's home directory in a single pass.
+    The gray-area subfolders (SCAN_USER_GRAY_AREA_FOLDERS) are listed and recorded
+    via record_user_gray(), then one listing of the home dir's top level routes each
+    entry: included folders become (user, folder, target) summary task triples
+    (returned to the caller), ignored folders are skipped, and any other directory
+    is recorded as a gray area. Replaces the separate manual-customization and
+    gray-area listings that each re-read the same home directory.
     """
-    results = {}
-    users_dir = "/Users"
+    tasks = []
     try:
-        for user in os.listdir(users_dir):
-            user_path = os.path.join(users_dir, user)
-            if not os.path.isdir(user_path) or user.lower() in ["shared", "guest"]:
-                continue
-            # Scan Items in the User's Application Support
-            for gray_folder in SCAN_USER_GRAY_AREA_FOLDERS:
-                scan_path = os.path.join(user_path, gray_folder)
-                if os.path.isdir(scan_path):
-                    for item in os.listdir(scan_path):
-                        if item in IGNORE_USER_FOLDERS or item.startswith("com."):
-                            record_ignore_path(os.path.join(scan_path, item))
+        # Scan Items in the User's Application Support (and similar gray folders)
+        for gray_folder in SCAN_USER_GRAY_AREA_FOLDERS:
+            scan_path = f"{user_path}/{gray_folder}"
+            if os.path.isdir(scan_path):
+                with os.scandir(scan_path) as entries:
+                    for entry in entries:
+                        if entry.name in IGNORE_USER_FOLDERS or entry.name.startswith("com."):
+                            record_ignore_path(entry.path)
                             continue
-                        target = os.path.join(scan_path, item)
-                        if os.path.isdir(target):
-                            sys.stdout.write(f"A => ")
-                            record_user_gray(user, target)
-
-            # Scan items in the User's Home Dir
-            for item in os.listdir(user_path):
-                if item in INCLUDE_USER_FOLDERS or item in IGNORE_USER_FOLDERS:
+                        # is_dir() reads the d_type cached from the directory
+                        # listing — no stat per entry
+                        if entry.is_dir(follow_symlinks=False):
+                            if DEBUG:
+                                sys.stdout.write(f"A => ")
+                            record_user_gray(user, entry.path)
+
+        # Route the items in the User's Home Dir in one listing
+        with os.scandir(user_path) as entries:
+            for entry in entries:
+                if entry.name in INCLUDE_USER_FOLDERS:
+                    if entry.is_dir(follow_symlinks=False):
+                        tasks.append((user, entry.name, entry.path))
+                    continue
+                if entry.name in IGNORE_USER_FOLDERS:
                     continue
-                target = os.path.join(user_path, item)
-                if os.path.isdir(target):
-                    sys.stdout.write(f"B => ")
-                    record_user_gray(user, target)
+                if entry.is_dir(follow_symlinks=False):
+                    if DEBUG:
+                        sys.stdout.write(f"B => ")
+                    record_user_gray(user, entry.path)
     except Exception:
         pass
+    return tasks
 
 def record_user_gray(user, record_path):
     """
@@ -423,8 +697,10 @@ def record_user_gray(user, record_path):
     path_within_user_str = record_path[len(user_path):]
     register_scanned_path(record_path)
     try:
-        contents = os.listdir(record_path)
-        contents = [c for c in contents if not should_ignore_name(c)]
+        # Filter while iterating scandir rather than building the full
+        # unfiltered name list first.
+        with os.scandir(record_path) as entries:
+            contents = [e.name for e in entries if not e.name.startswith('.')]
     except Exception:
         contents = []
     if user not in global_user_gray:
@@ -438,13 +714,17 @@ def gather_top_level_gray_area():
     and updates global_top_level_gray.
     """
     try:
-        for entry in os.listdir("/"):
-            full_path = os.path.join("/", entry)
-            if os.path.isdir(full_path):
-                if any(full_path.startswith(ig) for ig in IGNORED_ROOT_DIRS) or any(full_path.startswith(ig) for ig in INCLUDE_ROOT_DIRS):
-                    continue
-                sys.stdout.write(f"C => #{full_path}")
-                record_top_level_gray(full_path)
+        with os.scandir("/") as entries:
+            for entry in entries:
+                # is_dir() answers from the d_type cached by the directory read,
+                # so no extra stat per root entry.
+                if entry.is_dir(follow_symlinks=False):
+                    full_path = entry.path
+                    if full_path in _IGNORED_OR_INCLUDED_TOP:
+                        continue
+                    if DEBUG:
+                        sys.stdout.write(f"C => #{full_path}")
+                    record_top_level_gray(full_path)
     except Exception:
         pass
 
@@ -464,139 +744,104 @@ def record_ignore_path(path):
     Records a path in the global ignored_paths set.
     """
     global global_ignored_paths
-    register_scanned_path(path)
-    global_ignored_paths.add(path)
+    with _state_lock:
+        register_scanned_path(path)
+        global_ignored_paths.add(path)
 
 # --- REPORTING FUNCTION ---
 
+def _write_one(filename, lines):
+    """
+    Write one report file in a single buffered write.
+    Used as the unit of work when the gray-area files are written in parallel.
+    """
+    with open(filename, "w", buffering=1 << 20) as f:
+        f.write("".join(lines))
+
 def write_reports():
     """
     Writes out all accumulated data from global objects.
     No arguments are passed; the function uses the globals.
     """
     ensure_output_dirs()
-    # Write Manual Customizations Report
-    with open(MANUAL_FILE, "w") as f:
-        f.write("=== Manual Customizations Report ===\n\n")
-        
-        # System Applications Section
-        f.write("== /Applications ==\n")
-        f.write("Custom Applications (non-brew):\n")
-        if global_system_custom_apps:
-            for app in global_system_custom_apps:
-                f.write(f" - {app}\n")
-        else:
-            f.write(" (None found)\n")
-        f.write("\nBrew Cask Applications:\n")
-        if global_system_brew_apps:
-            for app in global_system_brew_apps:
-                f.write(f" - {app}\n")
-        else:
-            f.write(" (None found)\n")
-        
-        # Brew Formulas Section
-        f.write("\n== Brew Formulas (explicit installs) ==\n")
-        if global_brew_formulas:
-            for formula in global_brew_formulas:
-                f.write(f" - {formula}\n")
+    # Write Manual Customizations Report. Each section is accumulated into a
+    # list and the whole report is emitted as one buffered write.
+    lines = ["=== Manual Customizations Report ===\n\n"]
+
+    # System Applications Section
+    lines.append("== /Applications ==\n")
+    lines.append("Custom Applications (non-brew):\n")
+    if global_system_custom_apps:
+        lines.extend(f" - {app}\n" for app in global_system_custom_apps)
+    else:
+        lines.append(" (None found)\n")
+    lines.append("\nBrew Cask Applications:\n")
+    if global_system_brew_apps:
+        lines.extend(f" - {app}\n" for app in global_system_brew_apps)
+    else:
+        lines.append(" (None found)\n")
+
+    # Brew Formulas Section
+    lines.append("\n== Brew Formulas (explicit installs) ==\n")
+    if global_brew_formulas:
+        lines.extend(f" - {formula}\n" for formula in global_brew_formulas)
+    else:
+        lines.append(" (None found)\n")
+
+    # User Customizations Section
+    lines.append("\n== User Customizations ==\n")
+    for user, summaries in global_user_manual.items():
+        lines.append(f"\n-- User: {user} --\n")
+        if summaries:
+            lines.extend(f" - {line}\n" for line in summaries)
         else:
-            f.write(" (None found)\n")
-        
-        # User Customizations Section
-        f.write("\n== User Customizations ==\n")
-        for user, summaries in global_user_manual.items():
-            f.write(f"\n-- User: {user} --\n")
-            if summaries:
-                for line in summaries:
-                    f.write(f" - {line}\n")
-            else:
-                f.write(" (No custom folders found)\n")
+            lines.append(" (No custom folders found)\n")
+    _write_one(MANUAL_FILE, lines)
     
-    # Write Gray Area Reports
+    # Write Gray Area Reports. Each file's lines are assembled here, then all
+    # files are written concurrently — one _write_one task per file, so the
+    # open/write/close syscall paths overlap while each file stays ordered.
+    write_tasks = []  # list of (filename, lines) pairs
     # Per-user gray areas
     for user, folders in global_user_gray.items():
         filename = os.path.join(GRAY_AREA_DIR, f"user_{user}_gray_area.txt")
-        with open(filename, "w") as f:
-            f.write(f"Gray Area for user: {user}\n")
+        lines = [f"Gray Area for user: {user}\n"]
 
-            f.write("\nAI Prompt: Below is a listing of some things found in this user's home directory.\n")
-            for folder, contents in folders.items():
-                if not contents or folder == "/Library" or folder == "/.Trash":
-                    continue
+        lines.append("\nAI Prompt: Below is a listing of some things found in this user's home directory.\n")
+        for folder, contents in folders.items():
+            if not contents or folder == "/Library" or folder == "/.Trash":
+                continue
 
-                f.write(f"\n-- ~{folder} (top-level listing) --\n")
-                for item in contents:
-                    f.write(f" - {item}\n")
-
-            # Print AI Prompt Multi-line text:
-            f.write(textwrap.dedent("""\
-                AI Prompt Continued:                     
-                The Five‑Level Framework
-
-                The framework breaks down all observed modifications into five categories:
-                    1.	Default State of the Computer
-                Items and settings that come pre‑installed or pre‑configured by the operating system and vendor.
-                Examples:
-                    •	OS system files and folders
-                    •	Pre‑installed applications and default settings
-                    •	Standard library files and directories in /System or /Applications on macOS
-                    2.	Intentional Customizations
-                Modifications you deliberately make to tailor the system to your needs.
-                Examples:
-                    •	Manual configuration changes (shell profiles, custom app shortcuts)
-                    •	Installation of selected software packages (e.g., using Homebrew) where you explicitly choose the application
-                    •	Changes to system or application settings that are applied deliberately
-                    3.	User‑Created Documents
-                Files that you generate or save for work, personal projects, or other purposes. These are typically important data that require regular backup.
-                Examples:
-                    •	Documents in your ~/Documents folder
-                    •	Files saved on the Desktop or other designated data directories
-                    •	Project files and code that are not part of system configurations
-                    4.	Cascading Dependencies (Side‑Effects of Intentional Changes)
-                Additional files or libraries that are installed automatically when you perform an intentional action. These are not explicitly chosen by you but are brought in as a dependency.
-                Examples:
-                    •	When installing MySQL via Homebrew, libraries (such as a curses library) that are installed automatically
-                    •	Auto‑resolved dependency packages that are not manually selected
-                    5.	Transactional (Ephemeral) Files
-                Files generated during regular system use that are transient or routine byproducts. These files typically do not require manual backup or long‑term tracking.
-                Examples:
-                    •	Log files (in /var/log or ~/Library/Logs)
-                    •	Cache files (in /Library/Caches or application‑specific cache directories)
-                    •	Temporary files created during application use
-
-                My goal in giving you this is that you can identify the:
-                - Intentional Customizations
-                - User‑Created Documents
-
-                ... and ignore everything else.  You are preparing to back up this stuff we DO care about. Give me:
-                1. a list of top-level items only that can be ignored and why
-                2. give me a command to do a `tar -czvpf` (to be run from within that home dir) to zip up of the ones that are worth keeping
-                3. Give me a paragraph with the reasoning behind keeping the files you chose.
-
-                Please, lean towards excluding more than including.  We want to be sure we are not backing up unnecessary files.  If you are unsure about a file, it is better to exclude it.  We can always come back and add it later if needed.  Especially with dot files and folders, if it is from a package you recognize, and it doesn't have secret keys or something, then I don't really want to keep it.
-                """))
+            lines.append(f"\n-- ~{folder} (top-level listing) --\n")
+            lines.extend(f" - {item}\n" for item in contents)
+
+        # Print AI Prompt Multi-line text:
+        lines.append(USER_GRAY_AI_PROMPT)
+        write_tasks.append((filename, lines))
     # Top-level gray areas (from initial gather)
     for dir_path, items in global_top_level_gray.items():
         safe_name = dir_path.strip("/").replace("/", "_") or "root"
         filename = os.path.join(GRAY_AREA_DIR, f"{safe_name}_gray_area.txt")
-        with open(filename, "w") as f:
-            f.write(f"Gray Area for {dir_path} (top-level listing):\n")
-            for item in items:
-                f.write(f" - {item}\n")
+        lines = [f"Gray Area for {dir_path} (top-level listing):\n"]
+        lines.extend(f" - {item}\n" for item in items)
+        write_tasks.append((filename, lines))
     # Remaining gray areas (from crawl_remaining_paths)
     for dir_path, items in global_remaining_gray.items():
         safe_name = dir_path.strip("/").replace("/", "_") or "root"
         filename = os.path.join(GRAY_AREA_DIR, f"{safe_name}_remaining_gray.txt")
-        with open(filename, "w") as f:
-            f.write(f"Remaining Gray Area for {dir_path} (shallow listing):\n")
-            for item in items:
-                f.write(f" - {item}\n")
-    
+        lines = [f"Remaining Gray Area for {dir_path} (shallow listing):\n"]
+        lines.extend(f" - {item}\n" for item in items)
+        write_tasks.append((filename, lines))
+
+    if write_tasks:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(_write_one, fn, ls) for fn, ls in write_tasks]:
+                future.result()
+
     # Write Ignored Directories
-    with open(IGNORED_FILE, "w") as f:
-        f.write("Ignored Directories (not scanned):\n")
-        for d in global_ignored_paths:
-            f.write(f" - {d}\n")
+    lines = ["Ignored Directories (not scanned):\n"]
+    lines.extend(f" - {d}\n" for d in global_ignored_paths)
+    _write_one(IGNORED_FILE, lines)
 
 # --- MAIN DRIVER ---
 
@@ -607,18 +852,26 @@ def main():
     for ig in IGNORED_ROOT_DIRS:
         record_ignore_path(ig)
 
-    # Gather brew data
-    print("Gathering brew data...")
-    brew_casks = get_brew_casks()  # still returned, to be passed into system app processing
+    # Run every gather phase concurrently: the brew commands are
+    # subprocess-bound (seconds of Ruby startup) and the filesystem gathers
+    # walk disjoint subtrees, so only the shared path registry needs the
+    # _state_lock they already take. The /Applications classification is the
+    # one dependency — it waits on the cask future inside its own task.
+    print("Gathering brew data and filesystem areas concurrently...")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        casks_future = executor.submit(get_brew_casks)
+        leaves_future = executor.submit(get_brew_leaves)
+        user_future = executor.submit(gather_user_areas)        # updates global_user_manual & global_user_gray
+        top_future = executor.submit(gather_top_level_gray_area)  # updates global_top_level_gray
+        apps_future = executor.submit(
+            lambda: gather_system_applications(casks_future.result()))
+
+        brew_casks = casks_future.result()  # still returned, for the closing summary print
+        gather_brew_formulas(leaves_future.result())  # updates global_brew_formulas
+        user_future.result()
+        top_future.result()
+        apps_future.result()  # updates global_system_custom_apps & global_system_brew_apps
     print("Casks:", brew_casks)
-    gather_brew_formulas()         # updates global_brew_formulas
-    print("Gathering system applications...")
-    gather_system_applications(brew_casks)  # updates global_system_custom_apps & global_system_brew_apps
-    print("Gathering user manual customizations...")
-    gather_user_manual_customizations()       # updates global_user_manual
-    print("Gathering gray areas...")
-    gather_user_gray_area()                   # updates global_user_gray
-    gather_top_level_gray_area()              # updates global_top_level_gray
     
     # Now crawl the remaining paths and update global_remaining_gray.
     print("Starting full crawl of remaining paths (debug output will update on one line)...")